@@ -1,12 +1,11 @@
 import csv
 import requests
-import urllib3
 from getpass import getpass
 from datetime import datetime
 import configparser
 import xml.etree.ElementTree as ET
-
-urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+import panw_api
+from panw_records import group_values
 
 # --- Configuration ---
 config = configparser.ConfigParser()
@@ -15,11 +14,15 @@ config = configparser.ConfigParser()
 # [PANW]
 # panorama_host = https://your_panorama_ip
 # address_group_csv = address_groups_to_delete.csv
+# max_payload_bytes = 524288  (optional)
+# bulk_timeout = 300  (optional)
 try:
     config.read("panw.cfg")
     PANORAMA_HOST = config.get("PANW", "panorama_host")
     CSV_FILE = config.get("PANW", "address_group_csv")
-except (configparser.NoSectionError, configparser.NoOptionError) as e:
+    PAYLOAD_BUDGET = config.getint("PANW", "max_payload_bytes", fallback=panw_api.DEFAULT_PAYLOAD_BUDGET)
+    BULK_TIMEOUT = config.getint("PANW", "bulk_timeout", fallback=panw_api.DEFAULT_BULK_TIMEOUT)
+except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
     print(f"Error reading configuration file: {e}")
     print("Please ensure 'panw.cfg' exists and is correctly formatted.")
     exit()
@@ -35,105 +38,67 @@ with open(OUTPUT_FILE, mode='w', newline='') as f:
     writer = csv.DictWriter(f, fieldnames=OUT_FIELDS)
     writer.writeheader()
 
-def export_then_delete_address_group(name, device_group=None):
+def export_then_delete_address_groups(location, names):
     """
-    Exports an address group to a CSV file and then deletes it from Panorama.
+    Exports address-groups to a CSV file and then deletes them from Panorama.
+
+    Names are processed in chunks that fit the payload budget, with one 'get'
+    and as few 'delete' calls as possible per chunk.
 
     Args:
-        name (str): The name of the address group to delete.
-        device_group (str, optional): The device group where the address group resides.
-                                     Defaults to None for a 'Shared' location.
+        location (str): The device group where the address-groups reside, or 'shared'.
+        names (list): The names of the address-groups to delete.
     """
-    is_shared = not device_group or device_group.strip().lower() == "shared"
-    location = "shared" if is_shared else device_group.strip()
-
-    if is_shared:
-        xpath = f"/config/shared/address-group/entry[@name='{name}']"
-    else:
-        xpath = (f"/config/devices/entry[@name='localhost.localdomain']"
-                 f"/device-group/entry[@name='{device_group.strip()}']"
-                 f"/address-group/entry[@name='{name}']")
-
-    print(f"[*] Processing: '{name}' in '{location}'")
-    print(f"    XPath: {xpath}")
-
-    # --- Step 1: Get the address group configuration ---
-    export_params = {
-        'type': 'config',
-        'action': 'get',
-        'xpath': xpath,
-        'key': API_KEY
-    }
-
-    try:
-        response = requests.get(f"{PANORAMA_HOST}/api/", params=export_params, verify=False, timeout=10)
-        response.raise_for_status() # Raise an exception for bad status codes
-    except requests.exceptions.RequestException as e:
-        print(f"[!] HTTP Request failed: {e}")
-        return
-
-    # --- Step 2: Parse the XML response and back up the details ---
-    try:
-        root = ET.fromstring(response.content)
-        entry = root.find('.//entry')
-
-        if entry is None:
-            print(f"[!] Could not find address-group '{name}' in '{location}'.")
-            return
-
-        values = {"name": name, "location": location}
-
-        # Extract members (static or dynamic)
-        static_members = [m.text for m in entry.findall('./static/member')]
-        dynamic_filter = entry.find('./dynamic/filter')
-
-        if static_members:
-            values["members"] = ",".join(static_members)
-            values["dynamic_filter"] = ""
-        elif dynamic_filter is not None:
-            values["members"] = ""
-            values["dynamic_filter"] = dynamic_filter.text
-        else:
-            values["members"] = ""
-            values["dynamic_filter"] = ""
-
-        # Extract description and tags
-        description = entry.find('description')
-        values["description"] = description.text if description is not None else ""
-
-        tags = [t.text for t in entry.findall('./tag/member')]
-        values["tag"] = ",".join(tags)
-
-        # Write the extracted data to the backup CSV
+    container = panw_api.container_xpath(location, "address-group")
+    get_params = {'type': 'config', 'action': 'get'}
+
+    for chunk in panw_api.name_chunks(container, names, get_params, PAYLOAD_BUDGET):
+        xpath = panw_api.entries_xpath(container, chunk)
+        print(f"[*] Processing {len(chunk)} address-group(s) in '{location}'")
+
+        # --- Step 1: Get the address-group configuration ---
+        try:
+            response = panw_api.api_request(PANORAMA_HOST, API_KEY, {**get_params, 'xpath': xpath},
+                                            timeout=BULK_TIMEOUT)
+        except requests.exceptions.RequestException as e:
+            print(f"[!] HTTP Request failed: {e}")
+            continue
+
+        # --- Step 2: Parse the XML response and back up the details ---
+        try:
+            root = ET.fromstring(response.content)
+        except ET.ParseError as e:
+            print(f"[!] Failed to parse XML response for '{location}': {e}")
+            print(f"    Response Text: {response.text}")
+            continue
+
+        wanted = set(chunk)
+        found = []
         with open(OUTPUT_FILE, mode='a', newline='') as f:
             writer = csv.DictWriter(f, fieldnames=OUT_FIELDS)
-            writer.writerow(values)
-        print(f"[✓] Successfully backed up '{name}'.")
-
-    except ET.ParseError as e:
-        print(f"[!] Failed to parse XML response for '{name}': {e}")
-        print(f"    Response Text: {response.text}")
-        return
-
-    # --- Step 3: Delete the address group ---
-    delete_params = {
-        'type': 'config',
-        'action': 'delete',
-        'xpath': xpath,
-        'key': API_KEY
-    }
-
-    try:
-        del_resp = requests.get(f"{PANORAMA_HOST}/api/", params=delete_params, verify=False, timeout=10)
-        del_resp.raise_for_status()
-
-        if 'status="success"' in del_resp.text:
-            print(f"[✓] Successfully deleted address-group '{name}' from '{location}'.")
-        else:
-            print(f"[!] Failed to delete '{name}': {del_resp.text}")
-
-    except requests.exceptions.RequestException as e:
-        print(f"[!] HTTP Request failed during deletion: {e}")
+            for entry in root.iter('entry'):
+                values = group_values(entry, location)
+                if values["name"] in wanted:
+                    writer.writerow(values)
+                    found.append(values["name"])
+                    print(f"[✓] Successfully backed up '{values['name']}'.")
+
+        backed_up = set(found)
+        for name in chunk:
+            if name not in backed_up:
+                print(f"[!] Could not find address-group '{name}' in '{location}'.")
+        if not found:
+            continue
+
+        # --- Step 3: Delete the backed-up address-groups ---
+        # A rejected chunk is retried entry by entry, so one referenced
+        # address-group does not block deletion of the rest.
+        for name, ok, error in panw_api.delete_entries(PANORAMA_HOST, API_KEY, container, found,
+                                                       PAYLOAD_BUDGET, BULK_TIMEOUT):
+            if ok:
+                print(f"[✓] Successfully deleted address-group '{name}' from '{location}'.")
+            else:
+                print(f"[!] Failed to delete '{name}': {error}")
 
 
 def main():
@@ -141,6 +106,8 @@ def main():
     Main function to read a CSV and initiate the deletion process.
     """
     try:
+        # Group names by location so each container gets batched calls
+        names_by_location = {}
         with open(CSV_FILE, newline='') as csvfile:
             reader = csv.reader(csvfile)
             next(reader, None)  # Skip header row
@@ -149,8 +116,12 @@ def main():
                     continue
                 name = row[0].strip()
                 device_group = row[1].strip() if len(row) > 1 and row[1].strip() else None
+                location = "shared" if not device_group or device_group.lower() == "shared" else device_group
                 if name:
-                    export_then_delete_address_group(name, device_group)
+                    names_by_location.setdefault(location, {})[name] = None
+
+        for location, names in names_by_location.items():
+            export_then_delete_address_groups(location, list(names))
     except FileNotFoundError:
         print(f"[!] Error: The input file '{CSV_FILE}' was not found.")
     except Exception as e:
@@ -0,0 +1,200 @@
+import csv
+import json
+import os
+import threading
+import requests
+from getpass import getpass
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import configparser
+import xml.etree.ElementTree as ET
+import panw_api
+from panw_records import ADDRESS_FIELDS, GROUP_FIELDS, address_values, group_values
+
+# --- Configuration ---
+config = configparser.ConfigParser()
+# Ensure you have a 'panw.cfg' file in the same directory
+# with a section like:
+# [PANW]
+# panorama_host = https://your_panorama_ip
+# Optional export settings:
+# export_dir = exports
+# export_jsonl = yes
+# export_workers = 8
+# bulk_timeout = 300
+try:
+    config.read("panw.cfg")
+    PANORAMA_HOST = config.get("PANW", "panorama_host")
+    EXPORT_DIR = config.get("PANW", "export_dir", fallback=".")
+    EXPORT_JSONL = config.getboolean("PANW", "export_jsonl", fallback=False)
+    EXPORT_WORKERS = config.getint("PANW", "export_workers", fallback=8)
+    BULK_TIMEOUT = config.getint("PANW", "bulk_timeout", fallback=panw_api.DEFAULT_BULK_TIMEOUT)
+except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
+    print(f"Error reading configuration file: {e}")
+    print("Please ensure 'panw.cfg' exists and is correctly formatted.")
+    exit()
+
+API_KEY = getpass("Enter PAN-OS API Key: ")
+
+# --- Output File Setup ---
+# Headers match the input formats of create_address_objects.py and
+# create_address_groups.py so an export can be replayed directly. Files are
+# written with a '.partial' suffix and only renamed once every container has
+# been exported, so readers such as lookup never see an incomplete snapshot.
+timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+ADDRESS_FILE = os.path.join(EXPORT_DIR, f"{timestamp}-address-objects-export.csv")
+GROUP_FILE = os.path.join(EXPORT_DIR, f"{timestamp}-address-groups-export.csv")
+JSONL_FILE = os.path.join(EXPORT_DIR, f"{timestamp}-inventory-export.jsonl")
+
+
+class InventoryWriter:
+    """
+    Thread-safe sink that streams exported rows straight to disk.
+
+    Rows are written as soon as they are parsed, so memory use stays bounded
+    by the entry currently being processed rather than the inventory size.
+    Output goes to '.partial' files until publish() is called.
+    """
+
+    def __init__(self, jsonl=False):
+        os.makedirs(EXPORT_DIR, exist_ok=True)
+        self._lock = threading.Lock()
+        self._files = []
+        self._writers = {}
+        for kind, path, fields in (("address", ADDRESS_FILE, ADDRESS_FIELDS),
+                                   ("address-group", GROUP_FILE, GROUP_FIELDS)):
+            f = open(f"{path}.partial", mode='w', newline='', encoding='utf-8')
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            self._files.append(f)
+            self._writers[kind] = writer
+        self._jsonl = open(f"{JSONL_FILE}.partial", mode='w', encoding='utf-8') if jsonl else None
+        if self._jsonl:
+            self._files.append(self._jsonl)
+        self.counts = {"address": 0, "address-group": 0}
+
+    def write(self, kind, values):
+        with self._lock:
+            self._writers[kind].writerow(values)
+            if self._jsonl:
+                self._jsonl.write(json.dumps({"kind": kind, **values}) + "\n")
+            self.counts[kind] += 1
+
+    def close(self):
+        for f in self._files:
+            f.close()
+
+    def publish(self):
+        """
+        Renames the closed '.partial' files to their final names.
+
+        The address objects file is renamed last, because lookup finds
+        snapshots by it and then expects the other files of the run to exist.
+        """
+        for path in (GROUP_FILE, JSONL_FILE if self._jsonl else None, ADDRESS_FILE):
+            if path:
+                os.replace(f"{path}.partial", path)
+
+
+def get_device_groups():
+    """
+    Returns the names of all device groups configured on Panorama.
+
+    Only the name attributes are requested so the (potentially very large)
+    device group configuration is never downloaded.
+    """
+    params = {
+        'type': 'config',
+        'action': 'get',
+        'xpath': f"{panw_api.DEVICE_GROUP_XPATH}/entry/@name"
+    }
+    response = panw_api.api_request(PANORAMA_HOST, API_KEY, params, timeout=BULK_TIMEOUT)
+    if not panw_api.is_success(response):
+        raise RuntimeError(f"Failed to list device groups: {panw_api.error_message(response)}")
+
+    root = ET.fromstring(response.content)
+    return [entry.get("name") for entry in root.iter("entry") if entry.get("name")]
+
+
+def export_container(location, kind, sink):
+    """
+    Streams one address or address-group container into the sink.
+
+    The response is parsed incrementally with iterparse, and each <entry> is
+    discarded once written, so large containers never sit fully in memory.
+
+    Returns:
+        int: The number of entries exported.
+    """
+    params = {
+        'type': 'config',
+        'action': 'get',
+        'xpath': panw_api.container_xpath(location, kind)
+    }
+    to_values = address_values if kind == "address" else group_values
+
+    count = 0
+    with panw_api.api_request(PANORAMA_HOST, API_KEY, params, timeout=BULK_TIMEOUT, stream=True) as response:
+        response.raw.decode_content = True
+
+        container = None
+        for event, element in ET.iterparse(response.raw, events=("start", "end")):
+            if event == "start":
+                if element.tag == "response" and element.get("status") != "success":
+                    raise RuntimeError(f"Panorama returned status '{element.get('status')}'")
+                if element.tag == kind:
+                    container = element
+                continue
+            if element.tag == "entry" and container is not None:
+                sink.write(kind, to_values(element, location))
+                count += 1
+                container.clear()
+    return count
+
+
+def main():
+    """
+    Main function to export every address object and address group from
+    'shared' and all device groups.
+    """
+    try:
+        locations = ["shared"] + get_device_groups()
+    except (requests.exceptions.RequestException, ET.ParseError, RuntimeError) as e:
+        print(f"[!] Could not enumerate device groups: {e}")
+        return
+
+    print(f"[*] Exporting {len(locations)} location(s) with {EXPORT_WORKERS} worker(s)...")
+    sink = InventoryWriter(jsonl=EXPORT_JSONL)
+    failures = 0
+    try:
+        with ThreadPoolExecutor(max_workers=EXPORT_WORKERS) as executor:
+            futures = {
+                executor.submit(export_container, location, kind, sink): (location, kind)
+                for location in locations
+                for kind in ("address", "address-group")
+            }
+            for future in as_completed(futures):
+                location, kind = futures[future]
+                try:
+                    count = future.result()
+                    print(f"[✓] Exported {count} {kind} entries from '{location}'.")
+                except (requests.exceptions.RequestException, ET.ParseError, RuntimeError) as e:
+                    failures += 1
+                    print(f"[!] Failed to export {kind} from '{location}': {e}")
+    finally:
+        sink.close()
+
+    if failures:
+        print(f"[!] {failures} container(s) failed to export; the incomplete snapshot is left in "
+              f"'{ADDRESS_FILE}.partial' and '{GROUP_FILE}.partial'.")
+        exit(1)
+
+    sink.publish()
+    print(f"[*] Wrote {sink.counts['address']} address objects to '{ADDRESS_FILE}'.")
+    print(f"[*] Wrote {sink.counts['address-group']} address groups to '{GROUP_FILE}'.")
+    if EXPORT_JSONL:
+        print(f"[*] Wrote combined JSONL inventory to '{JSONL_FILE}'.")
+
+
+if __name__ == "__main__":
+    main()
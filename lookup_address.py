@@ -0,0 +1,171 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import configparser
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from panw_records import Inventory
+from panw_index import AddressIndex
+
+# --- Configuration ---
+config = configparser.ConfigParser()
+# Ensure you have a 'panw.cfg' file in the same directory. By default the
+# newest complete export-all snapshot in 'export_dir' is used; to pin a
+# snapshot, add:
+# [PANW]
+# snapshot_address_csv = exports/20250101-020000-address-objects-export.csv
+# snapshot_group_csv = exports/20250101-020000-address-groups-export.csv
+try:
+    config.read("panw.cfg")
+    EXPORT_DIR = config.get("PANW", "export_dir", fallback=".")
+    SNAPSHOT_ADDRESS_CSV = config.get("PANW", "snapshot_address_csv", fallback=None)
+    SNAPSHOT_GROUP_CSV = config.get("PANW", "snapshot_group_csv", fallback=None)
+except configparser.NoSectionError as e:
+    print(f"Error reading configuration file: {e}")
+    print("Please ensure 'panw.cfg' exists and is correctly formatted.")
+    exit()
+
+
+ADDRESS_SUFFIX = "-address-objects-export.csv"
+GROUP_SUFFIX = "-address-groups-export.csv"
+
+
+def newest_snapshot():
+    """
+    Returns the address and group CSVs of the most recent complete export-all run.
+
+    export-all only renames its files into place once every container has
+    been exported, renaming the address objects file last, so a run counts as
+    complete when both files with its timestamp exist.
+
+    Returns:
+        tuple: (address_csv, group_csv), or (None, None) if there is no snapshot.
+    """
+    for address_csv in sorted(glob.glob(os.path.join(EXPORT_DIR, f"*{ADDRESS_SUFFIX}")), reverse=True):
+        group_csv = address_csv[:-len(ADDRESS_SUFFIX)] + GROUP_SUFFIX
+        if os.path.exists(group_csv):
+            return address_csv, group_csv
+    return None, None
+
+
+def run_lookup(index, query):
+    """
+    Runs a single query and returns the result as a JSON-serialisable dict.
+
+    Raises:
+        ValueError: If the query is not a valid IP address or network.
+    """
+    started = time.perf_counter()
+    result = index.lookup(query)
+    elapsed_us = (time.perf_counter() - started) * 1_000_000
+
+    def objects(records, match):
+        return [{"name": r.name, "location": r.location, "type": r.type,
+                 "value": r.value, "match": match} for r in records]
+
+    return {
+        "query": query,
+        "objects": objects(result["containing"], "contains") + objects(result["overlapping"], "overlaps"),
+        "groups": [{"name": g.name, "location": g.location} for g in result["groups"]],
+        "elapsed_us": round(elapsed_us, 1),
+    }
+
+
+def print_lookup(index, query):
+    try:
+        result = run_lookup(index, query)
+    except ValueError as e:
+        print(f"[!] Invalid query '{query}': {e}")
+        return
+
+    print(f"[*] {query}: {len(result['objects'])} object(s), {len(result['groups'])} group(s) "
+          f"({result['elapsed_us']} µs)")
+    for obj in result["objects"]:
+        print(f"    object  {obj['location']}/{obj['name']}  {obj['type']} {obj['value']}  ({obj['match']})")
+    for group in result["groups"]:
+        print(f"    group   {group['location']}/{group['name']}")
+
+
+def serve(index, bind, port):
+    """Serves lookups as JSON over HTTP: GET /lookup?q=10.1.2.3&q=10.0.0.0/16"""
+
+    class LookupHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            queries = parse_qs(url.query).get("q", [])
+            if url.path != "/lookup" or not queries:
+                self.send_json(400, {"error": "Use GET /lookup?q=<ip-or-cidr>"})
+                return
+            try:
+                self.send_json(200, [run_lookup(index, q) for q in queries])
+            except ValueError as e:
+                self.send_json(400, {"error": str(e)})
+
+        def send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((bind, port), LookupHandler)
+    print(f"[*] Serving lookups on http://{bind}:{port}/lookup?q=<ip-or-cidr>. Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[*] Stopped serving.")
+    finally:
+        server.server_close()
+
+
+def main():
+    """
+    Main function to load a snapshot, build the lookup index and answer
+    queries from the command line, an interactive prompt, or HTTP.
+    """
+    parser = argparse.ArgumentParser(
+        description="Find the address objects and groups that contain an IP or overlap a CIDR.")
+    parser.add_argument("queries", nargs="*", help="IP addresses or CIDRs to look up.")
+    parser.add_argument("--serve", action="store_true", help="Answer lookups over HTTP instead.")
+    parser.add_argument("--bind", default="127.0.0.1", help="Address to serve on (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8080, help="Port to serve on (default: 8080).")
+    args = parser.parse_args()
+
+    if SNAPSHOT_ADDRESS_CSV or SNAPSHOT_GROUP_CSV:
+        address_csv, group_csv = SNAPSHOT_ADDRESS_CSV, SNAPSHOT_GROUP_CSV
+    else:
+        address_csv, group_csv = newest_snapshot()
+    if not address_csv:
+        print(f"[!] No snapshot found in '{EXPORT_DIR}'. Run 'export-all' first or set snapshot_address_csv.")
+        sys.exit(1)
+
+    print(f"[*] Loading snapshot '{address_csv}'" + (f" and '{group_csv}'..." if group_csv else "..."))
+    started = time.perf_counter()
+    try:
+        index = AddressIndex(Inventory.from_csv(address_csv, group_csv))
+    except FileNotFoundError as e:
+        print(f"[!] Error: {e}")
+        sys.exit(1)
+    print(f"[✓] Indexed {len(index.inventory)} records in {time.perf_counter() - started:.1f}s"
+          + (f" ({index.skipped} unparseable value(s) or filter(s) skipped)." if index.skipped else "."))
+
+    if args.serve:
+        serve(index, args.bind, args.port)
+    elif args.queries:
+        for query in args.queries:
+            print_lookup(index, query)
+    else:
+        print("[*] Enter an IP or CIDR to look up (empty line or Ctrl+D to exit).")
+        try:
+            for line in iter(lambda: input("lookup> ").strip(), ""):
+                print_lookup(index, line)
+        except (EOFError, KeyboardInterrupt):
+            print()
+
+
+if __name__ == "__main__":
+    main()
@@ -93,8 +93,13 @@ def main():
         "delete-objects": "delete_address_objects.py",
         "delete-groups": "delete_address_groups.py",
         "create-objects": "create_address_objects.py",
-        "create-groups": "create_address_groups.py"
+        "create-groups": "create_address_groups.py",
+        "export-all": "export_address_inventory.py",
+        "watch": "watch_address_csvs.py",
+        "lookup": "lookup_address.py"
     }
+    # Only these actions parse command-line arguments; the others read panw.cfg
+    actions_with_args = {"lookup"}
 
     parser = argparse.ArgumentParser(
         description="A wrapper script to manage PAN-OS address objects and groups.",
@@ -102,11 +107,18 @@ def main():
         epilog=(
             "examples:\n"
             "  ./panw-wrapper.py delete-objects\n"
-            "  ./panw-wrapper.py create-groups"
+            "  ./panw-wrapper.py create-groups\n"
+            "  ./panw-wrapper.py export-all\n"
+            "  ./panw-wrapper.py watch\n"
+            "  ./panw-wrapper.py lookup 10.1.2.3 10.0.0.0/16"
         )
     )
     parser.add_argument("action", choices=scripts.keys(), help="The action to perform.")
+    parser.add_argument("script_args", nargs=argparse.REMAINDER,
+                        help="Extra arguments passed to the action (lookup only, e.g. queries).")
     args = parser.parse_args()
+    if args.script_args and args.action not in actions_with_args:
+        parser.error(f"action '{args.action}' does not take extra arguments: {' '.join(args.script_args)}")
 
     # Set up the virtual environment and dependencies
     setup_venv()
@@ -122,7 +134,7 @@ def main():
     try:
         # Execute the selected script using the venv's python
         # This propagates the return code of the child script.
-        process = subprocess.run([str(python_executable), str(script_to_run)], check=False)
+        process = subprocess.run([str(python_executable), str(script_to_run), *args.script_args], check=False)
         print(f"--- '{script_to_run.name}' finished with exit code {process.returncode} ---")
         sys.exit(process.returncode)
 
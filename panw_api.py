@@ -0,0 +1,309 @@
+"""
+Shared transport and XPath helpers for the PAN-OS XML API.
+
+Every call is sent as a form-encoded POST body with the API key in the
+``X-PAN-KEY`` header, so neither the key nor large ``element`` payloads end up
+in URLs (and therefore in proxy or web server access logs), and payload size is
+not capped by URL length limits.
+
+Bulk ``set`` and ``delete`` operations are split into chunks whose encoded
+request body stays within a byte budget (``max_payload_bytes`` in panw.cfg).
+A full chunk can take Panorama much longer to commit to its candidate config
+than a single entry, so bulk calls use a longer timeout (``bulk_timeout``).
+"""
+from urllib.parse import quote_plus, urlencode
+import xml.etree.ElementTree as ET
+
+import requests
+import urllib3
+
+urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+
+DEVICE_GROUP_XPATH = "/config/devices/entry[@name='localhost.localdomain']/device-group"
+DEFAULT_PAYLOAD_BUDGET = 512 * 1024
+DEFAULT_BULK_TIMEOUT = 300
+
+
+def api_request(host, api_key, params, timeout=10, stream=False):
+    """
+    Sends a single XML API call as a POST request.
+
+    Args:
+        host (str): The Panorama base URL, e.g. 'https://panorama'.
+        api_key (str): The PAN-OS API key, sent in the X-PAN-KEY header.
+        params (dict): The API parameters ('type', 'action', 'xpath', ...).
+        timeout (int): Request timeout in seconds.
+        stream (bool): Return without reading the body, for incremental parsing.
+
+    Returns:
+        requests.Response: The response, already checked for HTTP errors.
+    """
+    response = requests.post(f"{host}/api/", data=params, headers={"X-PAN-KEY": api_key},
+                             verify=False, timeout=timeout, stream=stream)
+    response.raise_for_status()
+    return response
+
+
+def is_success(response):
+    """Returns True if the API response reports status="success"."""
+    return 'status="success"' in response.text
+
+
+def error_message(response):
+    """Extracts the human-readable error message from a failed API response."""
+    try:
+        error_root = ET.fromstring(response.content)
+    except ET.ParseError:
+        return response.text
+    msg_element = error_root.find(".//msg")
+    if msg_element is None:
+        return response.text
+    return " ".join(t.strip() for t in msg_element.itertext() if t.strip()) or response.text
+
+
+def container_xpath(location, kind):
+    """Returns the XPath of the 'address' or 'address-group' container for a location."""
+    if location.lower() == "shared":
+        return f"/config/shared/{kind}"
+    return f"{DEVICE_GROUP_XPATH}/entry[@name='{location}']/{kind}"
+
+
+def name_predicate(name):
+    """Returns the XPath predicate term that matches one entry by name."""
+    return f"@name='{name}'"
+
+
+def entries_xpath(container, names):
+    """Returns an XPath selecting every named entry in a container with one predicate."""
+    return f"{container}/entry[{' or '.join(name_predicate(n) for n in names)}]"
+
+
+def encoded_size(text):
+    """Returns the size in bytes of a string once form-encoded into a POST body."""
+    return len(quote_plus(text))
+
+
+def chunk_by_budget(items, size_of, overhead, budget=DEFAULT_PAYLOAD_BUDGET):
+    """
+    Groups items into chunks whose total encoded size fits within a byte budget.
+
+    Args:
+        items (iterable): The items to send, e.g. XML entry strings or names.
+        size_of (callable): Returns the encoded size an item adds to the request.
+        overhead (int): Encoded size of the rest of the request body.
+        budget (int): Maximum encoded request body size in bytes. An item that
+                      is larger than the budget on its own is sent alone.
+
+    Yields:
+        list: Consecutive items that fit within the budget together.
+    """
+    chunk, size = [], overhead
+    for item in items:
+        item_size = size_of(item)
+        if chunk and size + item_size > budget:
+            yield chunk
+            chunk, size = [], overhead
+        chunk.append(item)
+        size += item_size
+    if chunk:
+        yield chunk
+
+
+def request_overhead(params):
+    """Returns the encoded size of a request body before the variable part is added."""
+    return len(urlencode(params))
+
+
+def name_chunks(container, names, params, budget=DEFAULT_PAYLOAD_BUDGET):
+    """
+    Splits entry names into chunks whose combined entries_xpath() fits the budget.
+
+    Args:
+        container (str): The container XPath the names live under.
+        names (list): The entry names to select.
+        params (dict): The other request parameters, without 'xpath'.
+        budget (int): Maximum encoded request body size in bytes.
+    """
+    overhead = request_overhead({**params, "xpath": f"{container}/entry[]"})
+    separator = encoded_size(" or ")
+    return chunk_by_budget(names, lambda n: encoded_size(name_predicate(n)) + separator,
+                           overhead, budget)
+
+
+def set_entries(host, api_key, container, entries, budget=DEFAULT_PAYLOAD_BUDGET,
+                timeout=DEFAULT_BULK_TIMEOUT):
+    """
+    Creates or updates entries in a container using as few 'set' calls as possible.
+
+    Entries are sent in multi-entry chunks that fit the byte budget. If
+    Panorama rejects a chunk, its entries are retried one at a time so the
+    failing entries can be reported individually.
+
+    Args:
+        container (str): The container XPath, e.g. from container_xpath().
+        entries (list): (name, xml_payload) tuples for each <entry> element.
+        budget (int): Maximum encoded request body size in bytes.
+        timeout (int): Timeout in seconds for each request.
+
+    Yields:
+        tuple: (name, succeeded, error message or None) for every entry.
+    """
+    params = {"type": "config", "action": "set", "xpath": container}
+    overhead = request_overhead({**params, "element": ""})
+
+    for chunk in chunk_by_budget(entries, lambda e: encoded_size(e[1]), overhead, budget):
+        try:
+            response = api_request(host, api_key,
+                                   {**params, "element": "".join(xml for _, xml in chunk)},
+                                   timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            for name, _ in chunk:
+                yield name, False, f"HTTP Request failed: {e}"
+            continue
+
+        if is_success(response):
+            for name, _ in chunk:
+                yield name, True, None
+        elif len(chunk) == 1:
+            yield chunk[0][0], False, error_message(response)
+        else:
+            yield from set_entries(host, api_key, container, chunk, budget=0, timeout=timeout)
+
+
+def _edit_entry(host, api_key, container, name, xml_payload, timeout):
+    params = {
+        "type": "config",
+        "action": "edit",
+        "xpath": entries_xpath(container, [name]),
+        "element": xml_payload
+    }
+    try:
+        response = api_request(host, api_key, params, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        return False, f"HTTP Request failed: {e}"
+    if is_success(response):
+        return True, None
+    return False, error_message(response)
+
+
+def edit_entries(host, api_key, container, entries, budget=DEFAULT_PAYLOAD_BUDGET,
+                 timeout=DEFAULT_BULK_TIMEOUT):
+    """
+    Replaces existing entries using as few calls as possible.
+
+    Unlike 'set', which merges into an existing entry (so removed members,
+    tags or descriptions would survive), 'edit' replaces it completely. The
+    API has no multi-entry 'edit', so each chunk is sent as one 'multi-config'
+    request (PAN-OS 9.0+) holding an <edit> per entry. Panorama applies a
+    multi-config all or nothing, so a rejected chunk is retried as one plain
+    'edit' per entry.
+
+    Args:
+        container (str): The container XPath, e.g. from container_xpath().
+        entries (list): (name, xml_payload) tuples for each <entry> element.
+        budget (int): Maximum encoded request body size in bytes.
+        timeout (int): Timeout in seconds for each request.
+
+    Yields:
+        tuple: (name, succeeded, error message or None) for every entry.
+    """
+    params = {"type": "config", "action": "multi-config"}
+    overhead = request_overhead({**params, "element": "<multi-config></multi-config>"})
+
+    operations = []
+    for index, (name, xml_payload) in enumerate(entries):
+        edit_el = ET.Element("edit", id=str(index), xpath=entries_xpath(container, [name]))
+        edit_el.append(ET.fromstring(xml_payload))
+        operations.append((name, xml_payload, ET.tostring(edit_el, encoding="unicode")))
+
+    for chunk in chunk_by_budget(operations, lambda op: encoded_size(op[2]), overhead, budget):
+        if len(chunk) > 1:
+            element = f"<multi-config>{''.join(op for _, _, op in chunk)}</multi-config>"
+            try:
+                response = api_request(host, api_key, {**params, "element": element}, timeout=timeout)
+                if is_success(response):
+                    for name, _, _ in chunk:
+                        yield name, True, None
+                    continue
+            except requests.exceptions.RequestException as e:
+                for name, _, _ in chunk:
+                    yield name, False, f"HTTP Request failed: {e}"
+                continue
+
+        for name, xml_payload, _ in chunk:
+            yield (name, *_edit_entry(host, api_key, container, name, xml_payload, timeout))
+
+
+def delete_entries(host, api_key, container, names, budget=DEFAULT_PAYLOAD_BUDGET,
+                   timeout=DEFAULT_BULK_TIMEOUT):
+    """
+    Deletes named entries from a container using as few 'delete' calls as possible.
+
+    Like set_entries(), a rejected chunk is retried one entry at a time.
+
+    Yields:
+        tuple: (name, succeeded, error message or None) for every name.
+    """
+    params = {"type": "config", "action": "delete"}
+
+    for chunk in name_chunks(container, names, params, budget):
+        try:
+            response = api_request(host, api_key, {**params, "xpath": entries_xpath(container, chunk)},
+                                   timeout=timeout)
+        except requests.exceptions.RequestException as e:
+            for name in chunk:
+                yield name, False, f"HTTP Request failed: {e}"
+            continue
+
+        if is_success(response):
+            for name in chunk:
+                yield name, True, None
+        elif len(chunk) == 1:
+            yield chunk[0], False, error_message(response)
+        else:
+            yield from delete_entries(host, api_key, container, chunk, budget=0, timeout=timeout)
+
+
+def _add_tags(element, tags):
+    if tags:
+        tag_el = ET.SubElement(element, "tag")
+        for tag in tags:
+            member_el = ET.SubElement(tag_el, "member")
+            member_el.text = tag
+
+
+def address_entry_xml(name, obj_type, value, description="", tags=()):
+    """Returns the XML <entry> payload for an ip-netmask, ip-range or fqdn address object."""
+    element = ET.Element("entry", name=name)
+    value_el = ET.SubElement(element, obj_type)
+    value_el.text = value
+
+    if description:
+        desc_el = ET.SubElement(element, "description")
+        desc_el.text = description
+
+    _add_tags(element, tags)
+    return ET.tostring(element, encoding="unicode")
+
+
+def group_entry_xml(name, members=(), dynamic_filter="", description="", tags=()):
+    """Returns the XML <entry> payload for a static or dynamic address group."""
+    element = ET.Element("entry", name=name)
+
+    if members:
+        static_el = ET.SubElement(element, "static")
+        for member in members:
+            member_el = ET.SubElement(static_el, "member")
+            member_el.text = member
+    elif dynamic_filter:
+        dynamic_el = ET.SubElement(element, "dynamic")
+        filter_el = ET.SubElement(dynamic_el, "filter")
+        filter_el.text = dynamic_filter
+
+    if description:
+        desc_el = ET.SubElement(element, "description")
+        desc_el.text = description
+
+    _add_tags(element, tags)
+    return ET.tostring(element, encoding="unicode")
+
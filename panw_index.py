@@ -0,0 +1,227 @@
+"""
+IP lookup index over an Inventory snapshot.
+
+Answers "which address objects and groups contain this IP, or overlap this
+CIDR?" in microseconds. The index is a level-compressed radix tree: instead of
+one node per bit (which would need millions of Python objects for a large
+inventory), every prefix length that actually occurs gets its own table of
+network addresses. A query then costs one hash lookup per prefix length
+shorter than the query (covering objects) plus one binary search per longer
+prefix length (objects overlapping the queried CIDR). ip-range objects are split
+into the CIDR blocks that exactly cover them; fqdn objects are not indexed.
+
+Group membership is resolved transitively through nested static groups and
+dynamic tag filters. Panorama's device group hierarchy is not part of an
+export, so a group member is resolved in the group's own location first and
+then in 'shared'.
+"""
+import ipaddress
+import re
+from bisect import bisect_left, bisect_right
+
+_FILTER_TOKENS = re.compile(r"\s*('[^']*'|\"[^\"]*\"|\(|\)|and\b|or\b|not\b)", re.IGNORECASE)
+
+
+def parse_tag_filter(expression):
+    """
+    Parses a dynamic address group filter such as "'web' and ('prod' or 'dr')".
+
+    Returns:
+        tuple: (predicate, tags) where predicate(tag_set) evaluates the filter
+               and tags is the set of tags the filter mentions.
+
+    Raises:
+        ValueError: If the filter uses syntax that is not supported.
+    """
+    tokens, position = [], 0
+    expression = expression.strip()
+    while position < len(expression):
+        match = _FILTER_TOKENS.match(expression, position)
+        if not match:
+            raise ValueError(f"Unsupported filter syntax at: {expression[position:]!r}")
+        tokens.append(match.group(1))
+        position = match.end()
+
+    mentioned = set()
+    index = 0
+
+    def peek():
+        return tokens[index].lower() if index < len(tokens) else None
+
+    def take():
+        nonlocal index
+        index += 1
+        return tokens[index - 1]
+
+    def parse_or():
+        terms = [parse_and()]
+        while peek() == "or":
+            take()
+            terms.append(parse_and())
+        return terms[0] if len(terms) == 1 else lambda tags: any(t(tags) for t in terms)
+
+    def parse_and():
+        terms = [parse_not()]
+        while peek() == "and":
+            take()
+            terms.append(parse_not())
+        return terms[0] if len(terms) == 1 else lambda tags: all(t(tags) for t in terms)
+
+    def parse_not():
+        if peek() == "not":
+            take()
+            term = parse_not()
+            return lambda tags: not term(tags)
+        return parse_atom()
+
+    def parse_atom():
+        token = take() if index < len(tokens) else None
+        if token == "(":
+            term = parse_or()
+            if peek() != ")":
+                raise ValueError(f"Unbalanced parentheses in filter: {expression!r}")
+            take()
+            return term
+        if token and token[0] in "'\"":
+            tag = token[1:-1]
+            mentioned.add(tag)
+            return lambda tags: tag in tags
+        raise ValueError(f"Unexpected token {token!r} in filter: {expression!r}")
+
+    predicate = parse_or()
+    if index != len(tokens):
+        raise ValueError(f"Unexpected token {tokens[index]!r} in filter: {expression!r}")
+    return predicate, mentioned
+
+
+def record_networks(record):
+    """Returns the IP networks an ip-netmask or ip-range record covers, or [] for other types."""
+    try:
+        if record.type == "ip-netmask":
+            return [ipaddress.ip_network(record.value, strict=False)]
+        if record.type == "ip-range":
+            first, last = (ipaddress.ip_address(v.strip()) for v in record.value.split("-", 1))
+            return list(ipaddress.summarize_address_range(first, last))
+    except (ValueError, TypeError):
+        pass
+    return []
+
+
+class AddressIndex:
+    """
+    Query index over the address objects and groups of an Inventory.
+
+    Args:
+        inventory (panw_records.Inventory): The snapshot to index.
+    """
+
+    __slots__ = ("inventory", "_tables", "_keys", "_parents", "skipped")
+
+    def __init__(self, inventory):
+        self.inventory = inventory
+        self.skipped = 0
+        # _tables[version][prefixlen] maps a network address (as int) to records
+        self._tables = {4: {}, 6: {}}
+        for record in inventory.iter_addresses():
+            networks = record_networks(record)
+            if not networks and record.type != "fqdn":
+                self.skipped += 1
+            for network in networks:
+                table = self._tables[network.version].setdefault(network.prefixlen, {})
+                table.setdefault(int(network.network_address), []).append(record)
+        # Sorted network addresses per prefix length, for range scans
+        self._keys = {version: {length: sorted(table) for length, table in tables.items()}
+                      for version, tables in self._tables.items()}
+        self._parents = self._build_parents()
+
+    def _resolve(self, location, name):
+        """Returns the (location, name) key a group member refers to."""
+        if name in self.inventory.addresses.get(location, {}) or name in self.inventory.groups.get(location, {}):
+            return location, name
+        return "shared", name
+
+    def _build_parents(self):
+        """Maps each (location, name) to the groups that directly contain it."""
+        parents = {}
+        by_tag = {}
+        for record in self.inventory.iter_addresses():
+            for tag in record.tags:
+                by_tag.setdefault(tag, []).append(record)
+
+        for group in self.inventory.iter_groups():
+            for member in self.inventory.member_names(group):
+                parents.setdefault(self._resolve(group.location, member), []).append(group)
+
+            if group.members or not group.dynamic_filter:
+                continue
+            try:
+                predicate, mentioned = parse_tag_filter(group.dynamic_filter)
+            except ValueError:
+                self.skipped += 1
+                continue
+            scope = (group.location, "shared")
+            if predicate(set()):
+                # The filter can match objects without any of its tags (e.g.
+                # "not 'dev'"), so every object in scope is a candidate
+                candidates = {id(r): r for location in scope
+                              for r in self.inventory.addresses.get(location, {}).values()}
+            else:
+                candidates = {id(r): r for tag in mentioned for r in by_tag.get(tag, ()) if r.location in scope}
+            for record in candidates.values():
+                if predicate(set(record.tags)):
+                    parents.setdefault((record.location, record.name), []).append(group)
+        return parents
+
+    def lookup(self, query):
+        """
+        Finds the address objects and groups that contain an IP or overlap a CIDR.
+
+        Args:
+            query (str): An IPv4/IPv6 address or network, e.g. '10.1.2.3' or '10.0.0.0/16'.
+
+        Returns:
+            dict: 'containing' lists records that contain the whole query,
+                  'overlapping' lists records that overlap the queried network
+                  without containing all of it, and
+                  'groups' lists every group that (transitively) includes any
+                  of those records.
+
+        Raises:
+            ValueError: If the query is not a valid address or network.
+        """
+        network = ipaddress.ip_network(query.strip(), strict=False)
+        start = int(network.network_address)
+        end = int(network.broadcast_address)
+        max_length = network.max_prefixlen
+
+        containing, overlapping = {}, {}
+        for length, table in self._tables[network.version].items():
+            if length <= network.prefixlen:
+                mask = ((1 << length) - 1) << (max_length - length)
+                for record in table.get(start & mask, ()):
+                    containing[id(record)] = record
+            else:
+                keys = self._keys[network.version][length]
+                for key in keys[bisect_left(keys, start):bisect_right(keys, end)]:
+                    for record in table[key]:
+                        overlapping[id(record)] = record
+        for key in containing:
+            overlapping.pop(key, None)
+
+        return {
+            "containing": list(containing.values()),
+            "overlapping": list(overlapping.values()),
+            "groups": self.groups_of(list(containing.values()) + list(overlapping.values())),
+        }
+
+    def groups_of(self, records):
+        """Returns every group that directly or transitively contains any of the records."""
+        found = {}
+        pending = [(r.location, r.name) for r in records]
+        while pending:
+            for group in self._parents.get(pending.pop(), ()):
+                key = (group.location, group.name)
+                if key not in found:
+                    found[key] = group
+                    pending.append(key)
+        return list(found.values())
@@ -0,0 +1,398 @@
+"""
+Compact in-memory model for large address object / address group inventories.
+
+Snapshot, diff and lookup features keep hundreds of thousands of records in
+memory at once, so instead of one dict per CSV row this module uses:
+
+- ``__slots__`` records, which have no per-instance ``__dict__``;
+- interned location, type and tag strings, so repeated values share one object,
+  and shared tag tuples, so records with the same tag set share one tuple;
+- group member lists stored as tuples of integer IDs into a name table that
+  holds member names only, reusing the name string of the member's record
+  when it is already loaded.
+
+Records are grouped per location: ``inventory.addresses[location][name]``.
+``diff_inventories()`` computes the row-level changes between two snapshots,
+and ``address_values()``/``group_values()`` turn exported XML entries into
+rows with the ``ADDRESS_FIELDS``/``GROUP_FIELDS`` columns.
+
+Run ``python panw_records.py [count]`` to benchmark memory use against plain
+dict rows for a synthetic inventory of ``count`` address objects.
+"""
+import csv
+import sys
+import tracemalloc
+
+ADDRESS_FIELDS = ["name", "value", "type", "description", "location", "tag"]
+GROUP_FIELDS = ["name", "members", "dynamic_filter", "description", "location", "tag"]
+
+
+def _location(row):
+    location = (row.get("location") or "").strip() or "shared"
+    return sys.intern("shared" if location.lower() == "shared" else location)
+
+
+def address_values(entry, location):
+    """Converts an address <entry> element into an address_csv row."""
+    values = {"name": entry.get("name"), "location": location}
+
+    for obj_type in ("ip-netmask", "ip-range", "fqdn"):
+        value_el = entry.find(obj_type)
+        if value_el is not None:
+            values["type"] = obj_type
+            values["value"] = value_el.text or ""
+            break
+    else:
+        values["type"] = "unknown"
+        values["value"] = ""
+
+    description = entry.find('description')
+    values["description"] = (description.text or "") if description is not None else ""
+    values["tag"] = ",".join(t.text for t in entry.findall('./tag/member') if t.text)
+    return values
+
+
+def group_values(entry, location):
+    """Converts an address-group <entry> element into an address_group_csv row."""
+    values = {"name": entry.get("name"), "location": location}
+
+    static_members = [m.text for m in entry.findall('./static/member') if m.text]
+    dynamic_filter = entry.find('./dynamic/filter')
+    values["members"] = ",".join(static_members)
+    if not static_members and dynamic_filter is not None:
+        values["dynamic_filter"] = dynamic_filter.text or ""
+    else:
+        values["dynamic_filter"] = ""
+
+    description = entry.find('description')
+    values["description"] = (description.text or "") if description is not None else ""
+    values["tag"] = ",".join(t.text for t in entry.findall('./tag/member') if t.text)
+    return values
+
+
+class AddressRecord:
+    """A single address object (ip-netmask, ip-range or fqdn)."""
+
+    __slots__ = ("name", "value", "type", "description", "location", "tags")
+
+    def __init__(self, name, value, type, description, location, tags):
+        self.name = name
+        self.value = value
+        self.type = type
+        self.description = description
+        self.location = location
+        self.tags = tags
+
+    def __eq__(self, other):
+        if not isinstance(other, AddressRecord):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    # Records compare by value but are mutable, so they are not hashable;
+    # key them by (location, name) or id() instead.
+    __hash__ = None
+
+    def __repr__(self):
+        return f"AddressRecord({self.name!r}, {self.value!r}, {self.type!r}, location={self.location!r})"
+
+
+class AddressGroupRecord:
+    """
+    A single static or dynamic address group.
+
+    ``members`` holds integer IDs from the owning Inventory's name table; use
+    ``Inventory.member_names()`` to resolve them.
+    """
+
+    __slots__ = ("name", "members", "dynamic_filter", "description", "location", "tags")
+
+    def __init__(self, name, members, dynamic_filter, description, location, tags):
+        self.name = name
+        self.members = members
+        self.dynamic_filter = dynamic_filter
+        self.description = description
+        self.location = location
+        self.tags = tags
+
+    def __eq__(self, other):
+        if not isinstance(other, AddressGroupRecord):
+            return NotImplemented
+        return all(getattr(self, s) == getattr(other, s) for s in self.__slots__)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"AddressGroupRecord({self.name!r}, location={self.location!r}, members={len(self.members)})"
+
+
+class Inventory:
+    """
+    A memory-compact collection of address objects and address groups.
+
+    Rows use the same keys as the address_csv and address_group_csv files,
+    so exports and input CSVs can be loaded directly.
+    """
+
+    __slots__ = ("addresses", "groups", "_names", "_name_ids", "_tag_sets")
+
+    def __init__(self):
+        self.addresses = {}
+        self.groups = {}
+        self._names = []
+        self._name_ids = {}
+        self._tag_sets = {}
+
+    def _tags(self, field):
+        """Returns the shared tuple of interned tags for a comma-separated CSV field."""
+        field = field or ""
+        tags = self._tag_sets.get(field)
+        if tags is None:
+            tags = tuple(sys.intern(t.strip()) for t in field.split(",") if t.strip())
+            self._tag_sets[field] = tags
+        return tags
+
+    def name_id(self, name, location="shared"):
+        """
+        Returns the integer ID for a group member name, allocating one if needed.
+
+        Args:
+            name (str): The member name.
+            location (str): The group's location. If the member is already
+                            loaded there or in 'shared', the table reuses that
+                            record's name string instead of keeping a copy.
+        """
+        name_id = self._name_ids.get(name)
+        if name_id is None:
+            record = None
+            for store in (self.addresses, self.groups):
+                record = store.get(location, {}).get(name) or store.get("shared", {}).get(name)
+                if record is not None:
+                    name = record.name
+                    break
+            name_id = len(self._names)
+            self._names.append(name)
+            self._name_ids[name] = name_id
+        return name_id
+
+    def name_of(self, name_id):
+        """Returns the name for an ID allocated by name_id()."""
+        return self._names[name_id]
+
+    def member_names(self, group):
+        """Returns the member names of a group record as a list of strings."""
+        return [self._names[i] for i in group.members]
+
+    def add_address(self, row):
+        """
+        Adds an address object from an address_csv row.
+
+        Args:
+            row (dict): Expected keys: 'name', 'value', 'type', 'description',
+                        'location', 'tag'.
+
+        Returns:
+            AddressRecord: The stored record, or None if the row has no name.
+        """
+        name = (row.get("name") or "").strip()
+        if not name:
+            return None
+        location = _location(row)
+        record = AddressRecord(
+            name,
+            (row.get("value") or "").strip(),
+            sys.intern((row.get("type") or "").strip().lower()),
+            (row.get("description") or "").strip(),
+            location,
+            self._tags(row.get("tag")),
+        )
+        self.addresses.setdefault(location, {})[name] = record
+        return record
+
+    def add_group(self, row):
+        """
+        Adds an address group from an address_group_csv row.
+
+        Args:
+            row (dict): Expected keys: 'name', 'members', 'dynamic_filter',
+                        'description', 'location', 'tag'.
+
+        Returns:
+            AddressGroupRecord: The stored record, or None if the row has no name.
+        """
+        name = (row.get("name") or "").strip()
+        if not name:
+            return None
+        location = _location(row)
+        members = tuple(self.name_id(m.strip(), location)
+                        for m in (row.get("members") or "").split(",") if m.strip())
+        record = AddressGroupRecord(
+            name,
+            members,
+            (row.get("dynamic_filter") or "").strip(),
+            (row.get("description") or "").strip(),
+            location,
+            self._tags(row.get("tag")),
+        )
+        self.groups.setdefault(location, {})[name] = record
+        return record
+
+    def address_row(self, record):
+        """Converts an AddressRecord back into an address_csv row."""
+        return {
+            "name": record.name,
+            "value": record.value,
+            "type": record.type,
+            "description": record.description,
+            "location": record.location,
+            "tag": ",".join(record.tags),
+        }
+
+    def group_row(self, record):
+        """Converts an AddressGroupRecord back into an address_group_csv row."""
+        return {
+            "name": record.name,
+            "members": ",".join(self.member_names(record)),
+            "dynamic_filter": record.dynamic_filter,
+            "description": record.description,
+            "location": record.location,
+            "tag": ",".join(record.tags),
+        }
+
+    def iter_addresses(self):
+        for records in self.addresses.values():
+            yield from records.values()
+
+    def iter_groups(self):
+        for records in self.groups.values():
+            yield from records.values()
+
+    def __len__(self):
+        return (sum(len(r) for r in self.addresses.values())
+                + sum(len(r) for r in self.groups.values()))
+
+    def load_address_csv(self, path):
+        """Adds every row of an address_csv file, reading one row at a time."""
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                self.add_address(row)
+
+    def load_group_csv(self, path):
+        """Adds every row of an address_group_csv file, reading one row at a time."""
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                self.add_group(row)
+
+    @classmethod
+    def from_csv(cls, address_csv=None, group_csv=None):
+        """
+        Loads an inventory from address_csv and/or address_group_csv files.
+
+        Rows are read one at a time, so only the compact records are kept.
+        """
+        inventory = cls()
+        if address_csv:
+            inventory.load_address_csv(address_csv)
+        if group_csv:
+            inventory.load_group_csv(group_csv)
+        return inventory
+
+
+def diff_inventories(old, new):
+    """
+    Computes the row-level changes needed to turn one inventory into another.
+
+    Records are compared through their CSV rows, so group members are matched
+    by name even though each inventory has its own name table.
+
+    Args:
+        old (Inventory): The previously applied inventory.
+        new (Inventory): The desired inventory.
+
+    Yields:
+        tuple: (kind, location, name, row), where kind is 'address' or
+               'address-group' and row is the new CSV row, or None if the
+               entry was removed.
+    """
+    for kind, old_store, new_store, to_row in (
+            ("address", old.addresses, new.addresses, "address_row"),
+            ("address-group", old.groups, new.groups, "group_row")):
+        for location in old_store.keys() | new_store.keys():
+            old_records = old_store.get(location, {})
+            new_records = new_store.get(location, {})
+            for name, record in new_records.items():
+                previous = old_records.get(name)
+                row = getattr(new, to_row)(record)
+                if previous is None or getattr(old, to_row)(previous) != row:
+                    yield kind, location, name, row
+            for name in old_records.keys() - new_records.keys():
+                yield kind, location, name, None
+
+
+def _synthetic_rows(count):
+    """Yields address and group rows shaped like a real device-group inventory."""
+    locations = [f"DG-{i:03d}" for i in range(50)] + ["shared"]
+    tags = ["internal", "external", "pci", "dmz", "prod", "dev"]
+    for i in range(count):
+        yield "address", {
+            "name": f"host-10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}",
+            "value": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}/32",
+            "type": "ip-netmask",
+            "description": "" if i % 4 else f"Server {i}",
+            "location": locations[i % len(locations)],
+            "tag": ",".join(tags[i % 3:i % 3 + 2]),
+        }
+    for g in range(count // 10):
+        # Ten members from the group's own location, as Panorama requires
+        first = g % len(locations) + len(locations) * 10 * (g // len(locations))
+        yield "address-group", {
+            "name": f"grp-{g}",
+            "members": ",".join(f"host-10.{j >> 16 & 255}.{j >> 8 & 255}.{j & 255}"
+                                for j in range(first, first + 10 * len(locations), len(locations))),
+            "dynamic_filter": "",
+            "description": "",
+            "location": locations[g % len(locations)],
+            "tag": tags[g % len(tags)],
+        }
+
+
+def _measure(build, count):
+    tracemalloc.start()
+    result = build(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    """Benchmarks the compact model against plain dict rows."""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    def build_dicts(n):
+        return [dict(row) for _, row in _synthetic_rows(n)]
+
+    def build_inventory(n):
+        inventory = Inventory()
+        for kind, row in _synthetic_rows(n):
+            if kind == "address":
+                inventory.add_address(row)
+            else:
+                inventory.add_group(row)
+        return inventory
+
+    print(f"[*] Benchmarking {count} address objects and {count // 10} address groups...")
+    rows, dict_bytes = _measure(build_dicts, count)
+    records = len(rows)
+    del rows
+    inventory, compact_bytes = _measure(build_inventory, count)
+
+    print(f"    - dict rows:  {dict_bytes / 2**20:8.1f} MiB ({dict_bytes / records:6.1f} bytes/record)")
+    print(f"    - Inventory:  {compact_bytes / 2**20:8.1f} MiB ({compact_bytes / len(inventory):6.1f} bytes/record)")
+    print(f"[✓] Inventory uses {compact_bytes / dict_bytes:.0%} of the dict-row footprint.")
+    # Both footprints grow linearly with the inventory, so scale to the 1M-object target
+    scale = 1_000_000 / count
+    print(f"[*] Projected for 1000000 address objects and {1_000_000 // 10} address groups: "
+          f"{compact_bytes * scale / 2**20:.0f} MiB (dict rows: {dict_bytes * scale / 2**20:.0f} MiB).")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+import os
+import csv
+import time
+from getpass import getpass
+import configparser
+import panw_api
+from panw_records import Inventory, diff_inventories
+
+# --- Configuration ---
+config = configparser.ConfigParser()
+# Ensure you have a 'panw.cfg' file in the same directory
+# with a section like:
+# [PANW]
+# panorama_host = https://your_panorama_ip
+# address_csv = inventory/address-objects.csv
+# address_group_csv = inventory/address-groups.csv
+# Optional watch settings:
+# watch_interval = 2
+# watch_settle_seconds = 5
+# watch_initial_sync = no
+# watch_retry_seconds = 30
+# watch_retry_max_seconds = 900
+try:
+    config.read("panw.cfg")
+    PANORAMA_HOST = config.get("PANW", "panorama_host")
+    ADDRESS_CSV = config.get("PANW", "address_csv", fallback=None)
+    GROUP_CSV = config.get("PANW", "address_group_csv", fallback=None)
+    PAYLOAD_BUDGET = config.getint("PANW", "max_payload_bytes", fallback=panw_api.DEFAULT_PAYLOAD_BUDGET)
+    BULK_TIMEOUT = config.getint("PANW", "bulk_timeout", fallback=panw_api.DEFAULT_BULK_TIMEOUT)
+    WATCH_INTERVAL = config.getfloat("PANW", "watch_interval", fallback=2.0)
+    WATCH_SETTLE = config.getfloat("PANW", "watch_settle_seconds", fallback=5.0)
+    WATCH_INITIAL_SYNC = config.getboolean("PANW", "watch_initial_sync", fallback=False)
+    WATCH_RETRY = config.getfloat("PANW", "watch_retry_seconds", fallback=30.0)
+    WATCH_RETRY_MAX = config.getfloat("PANW", "watch_retry_max_seconds", fallback=900.0)
+    if not ADDRESS_CSV and not GROUP_CSV:
+        raise configparser.NoOptionError("address_csv or address_group_csv", "PANW")
+except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
+    print(f"Error reading configuration file: {e}")
+    print("Please ensure 'panw.cfg' exists and is correctly formatted.")
+    exit()
+
+API_KEY = getpass("Enter PAN-OS API Key: ")
+
+ADDRESS_TYPES = ("ip-netmask", "ip-range", "fqdn")
+
+
+def file_signature(path):
+    """Returns (mtime, size) for a file, or None if it does not exist or cannot be read."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def split_field(value):
+    return [v.strip() for v in value.split(",") if v.strip()]
+
+
+def entry_xml(kind, row):
+    """
+    Builds the XML <entry> payload for a changed CSV row.
+
+    Returns:
+        str: The payload, or None if the row is not valid and is skipped.
+    """
+    if kind == "address-group":
+        return panw_api.group_entry_xml(row["name"], split_field(row["members"]), row["dynamic_filter"],
+                                        row["description"], split_field(row["tag"]))
+
+    if row["type"] not in ADDRESS_TYPES or not row["value"]:
+        print(f"[!] Skipping '{row['name']}' due to missing value or unknown type: '{row['type']}'.")
+        return None
+    return panw_api.address_entry_xml(row["name"], row["type"], row["value"],
+                                      row["description"], split_field(row["tag"]))
+
+
+def apply_changes(changes, previous):
+    """
+    Pushes row-level changes to Panorama.
+
+    New entries are created with batched 'set' calls, modified entries are
+    replaced with batched 'edit' calls, and removed entries are dropped with
+    batched 'delete' calls. Objects are written before groups so new members exist,
+    and groups are deleted before objects so no group still references a
+    deleted member.
+
+    Args:
+        changes (list): (kind, location, name, row) tuples from diff_inventories().
+        previous (Inventory): The inventory Panorama currently has, used to
+                              tell modified entries from new ones.
+
+    Returns:
+        tuple: (failed, skipped) sets of (kind, location, name) keys. failed
+               holds changes Panorama or the HTTP request rejected, skipped
+               holds rows that were not sent because they are invalid.
+    """
+    failed, skipped = set(), set()
+    pending = {
+        "set": {"address": {}, "address-group": {}},
+        "edit": {"address": {}, "address-group": {}},
+        "delete": {"address": {}, "address-group": {}},
+    }
+    for kind, location, name, row in changes:
+        if row is None:
+            pending["delete"][kind].setdefault(location, []).append(name)
+            continue
+        xml_payload = entry_xml(kind, row)
+        if not xml_payload:
+            skipped.add((kind, location, name))
+            continue
+        applied = previous.addresses if kind == "address" else previous.groups
+        action = "edit" if name in applied.get(location, {}) else "set"
+        pending[action][kind].setdefault(location, []).append((name, xml_payload))
+
+    for action, kind in (("set", "address"), ("edit", "address"),
+                         ("set", "address-group"), ("edit", "address-group"),
+                         ("delete", "address-group"), ("delete", "address")):
+        for location, items in pending[action][kind].items():
+            container = panw_api.container_xpath(location, kind)
+            if action == "set":
+                results = panw_api.set_entries(PANORAMA_HOST, API_KEY, container, items,
+                                               PAYLOAD_BUDGET, BULK_TIMEOUT)
+            elif action == "edit":
+                results = panw_api.edit_entries(PANORAMA_HOST, API_KEY, container, items,
+                                                PAYLOAD_BUDGET, BULK_TIMEOUT)
+            else:
+                results = panw_api.delete_entries(PANORAMA_HOST, API_KEY, container, items,
+                                                  PAYLOAD_BUDGET, BULK_TIMEOUT)
+
+            succeeded = 0
+            for name, ok, error in results:
+                if ok:
+                    succeeded += 1
+                else:
+                    failed.add((kind, location, name))
+                    print(f"[!] Failed to {action} {kind} '{name}' in '{location}': {error}")
+            status = "✓" if succeeded == len(items) else "!"
+            print(f"[{status}] {action}: {succeeded}/{len(items)} {kind} entries in '{location}'.")
+    return failed, skipped
+
+
+def revert_unapplied(previous, inventory, unapplied):
+    """
+    Puts every unapplied key of inventory back to its state in previous.
+
+    The result reflects what Panorama actually has, so the next diff picks the
+    unapplied rows up again and chooses 'set' or 'edit' from the real state.
+
+    Returns:
+        Inventory: inventory, modified in place.
+    """
+    for kind, location, name in unapplied:
+        if kind == "address":
+            store, old = inventory.addresses, previous.addresses.get(location, {}).get(name)
+        else:
+            store, old = inventory.groups, previous.groups.get(location, {}).get(name)
+        store.get(location, {}).pop(name, None)
+        if old is not None and kind == "address":
+            inventory.add_address(previous.address_row(old))
+        elif old is not None:
+            inventory.add_group(previous.group_row(old))
+    return inventory
+
+
+def load_inventory(optional=()):
+    """
+    Loads the configured CSV files into one Inventory.
+
+    Args:
+        optional (iterable): Paths that are treated as empty if they cannot be
+                             read, instead of raising, so the other file is
+                             still loaded.
+    """
+    inventory = Inventory()
+    for path, load in ((ADDRESS_CSV, inventory.load_address_csv), (GROUP_CSV, inventory.load_group_csv)):
+        if not path:
+            continue
+        try:
+            load(path)
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            if path not in optional:
+                raise
+            print(f"[!] Could not read '{path}' ({e}). Its rows will be pushed once it is readable.")
+    return inventory
+
+
+def main():
+    """
+    Main function to watch the configured CSV files and push only the rows
+    that changed since the previous version.
+
+    Files are polled by modification time and size. A change is applied once
+    the files have been quiet for 'watch_settle_seconds', so a burst of edits
+    (or a regeneration that rewrites the file several times) results in a
+    single batched apply.
+
+    Changes that fail are retried without waiting for the files to change,
+    after 'watch_retry_seconds', doubling up to 'watch_retry_max_seconds'.
+    Invalid rows are only reported again once the row itself changes.
+    """
+    paths = [p for p in (ADDRESS_CSV, GROUP_CSV) if p]
+    signatures = {p: file_signature(p) for p in paths}
+    # Invalid rows already reported, by (kind, location, name)
+    invalid = {}
+    retry_delay = 0
+
+    if WATCH_INITIAL_SYNC:
+        # Treat every existing row as new so the first apply pushes the full files
+        previous, changed_at = Inventory(), time.monotonic() - WATCH_SETTLE
+    else:
+        # Assume the current files are already applied and only push later edits
+        previous, changed_at = load_inventory(optional=paths), None
+
+    print(f"[*] Watching {', '.join(paths)} (poll every {WATCH_INTERVAL}s, settle {WATCH_SETTLE}s). "
+          f"Press Ctrl+C to stop.")
+    try:
+        while True:
+            latest = {p: file_signature(p) for p in paths}
+            if latest != signatures:
+                signatures = latest
+                changed_at = time.monotonic()
+            elif changed_at is not None and time.monotonic() - changed_at >= WATCH_SETTLE:
+                changed_at = None
+                # An unreadable file only counts as empty if none of its rows
+                # were applied, so a mid-rewrite file never turns into deletes.
+                empty = [p for p, applied in ((ADDRESS_CSV, previous.addresses), (GROUP_CSV, previous.groups))
+                         if p and not any(applied.values())]
+                try:
+                    inventory = load_inventory(optional=empty)
+                except (OSError, csv.Error, UnicodeDecodeError) as e:
+                    print(f"[!] Could not read the CSV files, waiting for the next update: {e}")
+                    continue
+
+                changes = list(diff_inventories(previous, inventory))
+                # Invalid rows are not sent again until the row itself changes
+                invalid = {c[:3]: c[3] for c in changes if c[:3] in invalid and invalid[c[:3]] == c[3]}
+                pending = [c for c in changes if c[:3] not in invalid]
+                if not pending:
+                    retry_delay = 0
+                    print("[*] Files changed, but no rows differ from the applied version.")
+                    continue
+
+                print(f"[*] Applying {len(pending)} changed row(s)...")
+                failed, skipped = apply_changes(pending, previous)
+                invalid.update({c[:3]: c[3] for c in pending if c[:3] in skipped})
+                previous = revert_unapplied(previous, inventory, failed | invalid.keys())
+                if skipped:
+                    print(f"[!] {len(skipped)} invalid row(s) were skipped and will be applied once corrected.")
+                if failed:
+                    # Retry without waiting for the files to change, backing off
+                    retry_delay = min(retry_delay * 2 or WATCH_RETRY, WATCH_RETRY_MAX)
+                    changed_at = time.monotonic() + retry_delay - WATCH_SETTLE
+                    print(f"[!] {len(failed)} change(s) failed and will be retried in {retry_delay:.0f}s.")
+                else:
+                    retry_delay = 0
+            time.sleep(WATCH_INTERVAL)
+    except KeyboardInterrupt:
+        print("\n[*] Stopped watching.")
+
+
+if __name__ == "__main__":
+    main()